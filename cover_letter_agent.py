@@ -2,21 +2,33 @@
 """Cover Letter Generator Agent using Connectonion"""
 
 from connectonion import Agent
-from custom_tools import PDFTool, TextFileTool, CoverLetterTool, PDFGeneratorTool
+from connectonion.history import History
+from custom_tools import PDFTool, TextFileTool, CoverLetterTool, PDFGeneratorTool, BatchTool, StreamingCoverLetterTool
 import os
 
-# Initialize tools
-pdf_tool = PDFTool()
-text_tool = TextFileTool()
-cover_letter_tool = CoverLetterTool()
-pdf_generator_tool = PDFGeneratorTool()
+def create_agent(name: str = "CoverLetterGenerator", history_dir: str = ""):
+    """Create a cover letter agent with its own set of tools
+    
+    Agents with the same name share one history file, so concurrent agents
+    need distinct names. history_dir keeps the history out of ~/.connectonion.
+    """
+    # Initialize tools
+    pdf_tool = PDFTool()
+    text_tool = TextFileTool()
+    cover_letter_tool = CoverLetterTool()
+    pdf_generator_tool = PDFGeneratorTool()
+    
+    # Create agent with all the tools
+    agent = Agent(
+        name=name,
+        tools=[pdf_tool, text_tool, cover_letter_tool, pdf_generator_tool],
+        system_prompt="prompts/CLGenerator.md",
+    )
+    if history_dir:
+        agent.history = History(name, save_dir=history_dir)
+    return agent
 
-# Create agent with all the tools
-agent = Agent(
-    name="CoverLetterGenerator",
-    tools=[pdf_tool, text_tool, cover_letter_tool, pdf_generator_tool],
-    system_prompt="prompts/CLGenerator.md",
-)
+agent = create_agent()
 
 def generate_cover_letter_interactive():
     """Interactive cover letter generation"""
@@ -68,7 +80,7 @@ def generate_cover_letter_interactive():
 
 def generate_cover_letter_direct(resume_pdf_path: str, job_txt_path: str, 
                                company_name: str = "", position_title: str = "",
-                               output_file: str = ""):
+                               output_file: str = "", agent: Agent = agent):
     """Direct cover letter generation with file paths"""
     
     print(f"🔄 Generating cover letter...")
@@ -103,14 +115,115 @@ def generate_cover_letter_direct(resume_pdf_path: str, job_txt_path: str,
     print(f"✅ Cover letter saved to: {output_file}")
     return output_file, result
 
+def generate_cover_letter_streaming(resume_pdf_path: str = "", job_txt_path: str = "",
+                                    company_name: str = "", position_title: str = "",
+                                    output_file: str = ""):
+    """Streaming cover letter generation, printing the letter as it is written"""
+    
+    if not resume_pdf_path:
+        resume_pdf_path = input("Enter the path to your resume PDF file: ").strip().strip('"')
+        job_txt_path = input("Enter the path to the job description text file: ").strip().strip('"')
+        company_name = input("Enter company name (optional): ").strip()
+        position_title = input("Enter position title (optional): ").strip()
+        output_file = input("Enter output file path (optional, will auto-generate if empty): ").strip().strip('"')
+    
+    if not output_file:
+        import datetime
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = os.path.abspath(f"./output/cover_letter_{timestamp}")
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, "cover_letter.txt")
+    
+    # Read the inputs directly, agent round trips would delay the first token
+    pdf_tool = PDFTool()
+    text_tool = TextFileTool()
+    resume_result = pdf_tool.extract_resume_text(resume_pdf_path)
+    resume_text = pdf_tool.get_last_extracted_text()
+    # Both PDF readers failing still reports success, with the error as the text
+    if not resume_text.strip() or resume_text.startswith("Error reading PDF"):
+        resume_result = f"Could not extract text from {resume_pdf_path}: {resume_text or 'no text found'}"
+    if not resume_result.startswith("Successfully extracted"):
+        print(f"❌ {resume_result}")
+        return output_file, resume_result
+    job_result = text_tool.read_job_description(job_txt_path)
+    if not job_result.startswith("Job description loaded"):
+        print(f"❌ {job_result}")
+        return output_file, job_result
+    
+    print(f"✍️ Writing cover letter (live preview in {output_file}.part)...\n")
+    streaming_tool = StreamingCoverLetterTool()
+    result = streaming_tool.stream_cover_letter(
+        resume_text=resume_text,
+        job_description=text_tool.get_last_content(),
+        company_name=company_name,
+        position_title=position_title,
+        output_file=output_file
+    )
+    print(f"\n\n{'✅' if not result.startswith('Error') else '❌'} {result}")
+    return output_file, result
+
+def generate_cover_letters_batch(manifest_path: str = "", results_path: str = "",
+                                 dedupe_threshold: float = None, use_llm: bool = None):
+    """Batch cover letter generation from a JSONL job manifest"""
+    
+    if not manifest_path:
+        manifest_path = input("Enter the path to the JSONL job manifest: ").strip().strip('"')
+    if not results_path:
+        results_path = input("Enter results file path (optional, will auto-generate if empty): ").strip().strip('"')
+    if not results_path:
+        results_path = os.path.splitext(manifest_path)[0] + ".results.jsonl"
+    if dedupe_threshold is None:
+        threshold = input("Near-duplicate threshold for job descriptions (optional, e.g. 0.8): ").strip()
+        try:
+            dedupe_threshold = float(threshold) if threshold else 0.0
+        except ValueError:
+            print(f"❌ Threshold must be a number between 0 and 1, got: {threshold}")
+            return results_path
+    
+    if use_llm is None:
+        use_llm = input("Write the letters with the LLM? (y/N): ").strip().lower() in ("y", "yes")
+    
+    if not os.path.exists(manifest_path):
+        print(f"❌ Manifest not found: {manifest_path}")
+        return results_path
+    
+    if not 0.0 <= dedupe_threshold <= 1.0:
+        print(f"❌ Threshold must be between 0 and 1, got: {dedupe_threshold}")
+        return results_path
+    
+    print(f"🔄 Processing jobs from: {manifest_path}")
+    print(f"📒 Results: {results_path} (completed jobs are skipped)")
+    
+    batch_tool = BatchTool(use_llm=use_llm)
+    succeeded = failed = 0
+    try:
+        for record in batch_tool.iter_batch(manifest_path, results_path,
+                                            dedupe_threshold=dedupe_threshold):
+            total = record["timings"]["total"]
+            if record["status"] == "ok":
+                succeeded += 1
+                reused = f", reused from line {record['duplicate_of']}" if "duplicate_of" in record else ""
+                print(f"✅ Line {record['line']}: {record['output']} ({total:.2f}s{reused})")
+            else:
+                failed += 1
+                print(f"❌ Line {record['line']}: {record['error']}")
+    except ValueError as e:
+        print(f"❌ Batch stopped: {str(e)}")
+        return results_path
+    
+    print(f"\n📊 Batch complete: {succeeded} succeeded, {failed} failed")
+    return results_path
+
 if __name__ == "__main__":
     # Example usage - you can modify these paths
     print("🎯 Cover Letter Generator")
     print("Choose an option:")
     print("1. Interactive mode (you'll be prompted for file paths)")
     print("2. Quick example with sample files")
+    print("3. Batch mode (JSONL job manifest)")
+    print("4. Streaming mode (see the letter as it is written)")
     
-    choice = input("Enter your choice (1 or 2): ").strip()
+    choice = input("Enter your choice (1-4): ").strip()
     
     if choice == "1":
         generate_cover_letter_interactive()
@@ -135,6 +248,10 @@ if __name__ == "__main__":
             print(f"   - {sample_resume}")
             print(f"   - {sample_job}")
             print("   Or use interactive mode (option 1)")
+    elif choice == "3":
+        generate_cover_letters_batch()
+    elif choice == "4":
+        generate_cover_letter_streaming()
     else:
         print("Invalid choice. Running interactive mode...")
         generate_cover_letter_interactive()
\ No newline at end of file
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Batch tool for generating cover letters from a JSONL job manifest"""
+
+import os
+import re
+import json
+import time
+from datetime import datetime
+from typing import Iterator
+
+from .PDFTool import PDFTool
+from .TextFileTool import TextFileTool
+from .CoverLetterTool import CoverLetterTool
+from .DedupTool import DedupTool
+from .StreamingCoverLetterTool import StreamingCoverLetterTool
+
+class BatchTool:
+    """Tool for streaming a JSONL file of jobs through the generation pipeline
+
+    Each manifest line is one JSON object:
+        {"resume": "resume.pdf", "job_description": "job.txt",
+         "company": "...", "position": "...", "output": "out/letter.txt"}
+    "job_text" may be given instead of "job_description" to pass the job
+    description inline. "company", "position" and "output" are optional.
+
+    One result line is appended to the results file as each job finishes, so
+    a crashed run can be resumed from the last completed line.
+
+    Letters come from the CoverLetterTool template, or from the LLM through
+    StreamingCoverLetterTool when use_llm is set. With a dedupe threshold,
+    near-duplicate job descriptions are clustered first and one letter is
+    generated per cluster and resume, then reused for every posting in the
+    cluster with its own company and position. This saves an LLM call per
+    duplicate; in template mode composing is cheap, so the saving is small.
+    """
+
+    def __init__(self, use_llm: bool = False):
+        self.pdf_tool = PDFTool()
+        self.text_tool = TextFileTool()
+        self.cover_letter_tool = CoverLetterTool()
+        self.streaming_tool = StreamingCoverLetterTool() if use_llm else None
+        # Only the most recent resume is cached so memory stays constant
+        self._resume_cache = ("", 0.0, "")
+        self._letter_cache = {}
+        self.last_summary = ""
+
+    def iter_jobs(self, manifest_path: str, start_after: int = 0) -> Iterator[tuple]:
+        """Yield (line_number, job, error) for each non-blank manifest line"""
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file, start=1):
+                if line_number <= start_after or not line.strip():
+                    continue
+                try:
+                    job = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, None, f"Invalid JSON: {str(e)}"
+                    continue
+                if not isinstance(job, dict):
+                    yield line_number, None, "Job must be a JSON object"
+                    continue
+                yield line_number, job, ""
+
+    def load_resume_text(self, resume_path: str) -> str:
+        """Extract resume text, reusing the previous result for the same file"""
+        mtime = os.path.getmtime(resume_path) if os.path.exists(resume_path) else 0.0
+        cached_path, cached_mtime, cached_text = self._resume_cache
+        if cached_path == resume_path and cached_mtime == mtime and cached_text:
+            return cached_text
+
+        result = self.pdf_tool.extract_resume_text(resume_path)
+        if not result.startswith("Successfully extracted"):
+            raise ValueError(result)
+
+        # Both readers failing still reports success, with the error as the text
+        text = self.pdf_tool.get_last_extracted_text()
+        if not text.strip() or text.startswith("Error reading PDF"):
+            raise ValueError(f"Could not extract text from {resume_path}: {text or 'no text found'}")
+        self._resume_cache = (resume_path, mtime, text)
+        return text
+
+    def load_job_text(self, job: dict) -> str:
+        """Get the job description text from an inline value or a file path"""
+        if job.get("job_text"):
+            return job["job_text"]
+
+        job_path = job.get("job_description", "")
+        if not job_path:
+            raise ValueError("Job needs either 'job_description' or 'job_text'")
+
+        result = self.text_tool.read_text_file(job_path)
+        if not result.startswith("Successfully read"):
+            raise ValueError(result)
+        return self.text_tool.last_read_content
+
+    def default_output_path(self, line_number: int) -> str:
+        """Build an output path like the interactive mode does"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = os.path.abspath(f"./output/cover_letter_{timestamp}_{line_number}")
+        return os.path.join(output_dir, "cover_letter.txt")
+
+    def cluster_jobs(self, manifest_path: str, threshold: float) -> dict:
+        """Map each manifest line to the first line of its near-duplicate cluster"""
+        dedup_tool = DedupTool(threshold=threshold)
+        clusters = {}
+        for line_number, job, error in self.iter_jobs(manifest_path):
+            if error:
+                continue
+            try:
+                job_text = self.load_job_text(job)
+            except ValueError:
+                continue
+            clusters[line_number] = int(dedup_tool.add(str(line_number), job_text))
+        return clusters
+
+    def process_job(self, job: dict, line_number: int = 0, cluster: int = 0) -> dict:
+        """Run one job through the pipeline and return its result record
+
+        Jobs passed the same cluster and resume share one generated letter.
+        """
+        record = {
+            "line": line_number,
+            "status": "ok",
+            "company": job.get("company", ""),
+            "position": job.get("position", ""),
+            "output": job.get("output", "") or self.default_output_path(line_number),
+            "error": "",
+            "timings": {},
+        }
+        timings = record["timings"]
+        start = time.perf_counter()
+        step = "resume"
+
+        try:
+            if not job.get("resume"):
+                raise ValueError("Job needs a 'resume' path")
+            resume_text = self.load_resume_text(job["resume"])
+            timings["resume"] = round(time.perf_counter() - start, 4)
+
+            step = "job_description"
+            step_start = time.perf_counter()
+            job_text = self.load_job_text(job)
+            timings["job_description"] = round(time.perf_counter() - step_start, 4)
+
+            step = "generate"
+            step_start = time.perf_counter()
+            # Letters are cached with {{company}}/{{position}} placeholders so
+            # one can be reused across a cluster of near-duplicates
+            letter_key = (job["resume"], cluster)
+            template = self._letter_cache.get(letter_key) if cluster else None
+            if template is None and self.streaming_tool:
+                result = self.streaming_tool.stream_cover_letter(
+                    resume_text, job_text, record["company"], record["position"],
+                    record["output"], job.get("generate_pdf", True), on_token=lambda token: None)
+                if result.startswith("Error"):
+                    raise ValueError(result)
+                timings["time_to_first_token"] = round(
+                    self.streaming_tool.last_timings.get("time_to_first_token", 0.0), 4)
+                if cluster:
+                    template = self._placeholder_letter(
+                        self.streaming_tool.last_cover_letter, record["company"], record["position"])
+                    if template:
+                        self._letter_cache[letter_key] = template
+            else:
+                if template is None:
+                    template = self.cover_letter_tool._compose_cover_letter(resume_text, job_text)
+                    if cluster:
+                        self._letter_cache[letter_key] = template
+                elif cluster != line_number:
+                    record["duplicate_of"] = cluster
+
+                cover_letter = self.cover_letter_tool._fill_cover_letter(
+                    template, record["company"], record["position"])
+                result = self.cover_letter_tool._save_cover_letter(
+                    cover_letter, record["output"], job.get("generate_pdf", True),
+                    position=record["position"], company=record["company"])
+            timings["generate"] = round(time.perf_counter() - step_start, 4)
+
+            if result.startswith("Cover letter generated but failed to save"):
+                raise ValueError(result)
+
+            # PDF problems are reported but do not fail the job, the TXT exists
+            if "PDF version saved to" in result:
+                record["pdf"] = os.path.splitext(record["output"])[0] + ".pdf"
+            elif "PDF generation" in result:
+                record["warning"] = result.split("\n", 1)[-1]
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{step}: {str(e)}"
+
+        timings["total"] = round(time.perf_counter() - start, 4)
+        return record
+
+    def _placeholder_letter(self, cover_letter: str, company: str, position: str) -> str:
+        """Turn an LLM-written letter back into a template for its cluster
+
+        The LLM writes the names freely, so only exact mentions of the
+        company and position are swapped for placeholders. Returns "" when
+        the company, or a given position, is not mentioned verbatim: the
+        letter would then name the wrong company in its duplicates.
+        """
+        if not company:
+            return ""
+        for value, placeholder in ((position, "{{position}}"), (company, "{{company}}")):
+            if value:
+                # Whole words only, so a position like "Dev" keeps "Developer"
+                pattern = r"(?<!\w)" + re.escape(value) + r"(?!\w)"
+                cover_letter, count = re.subn(pattern, lambda match: placeholder, cover_letter)
+                if not count:
+                    return ""
+        return cover_letter
+
+    def last_completed_line(self, results_path: str) -> int:
+        """Return the manifest line of the last complete result record
+
+        Complete lines that do not parse are skipped. Only a trailing record
+        without a newline (e.g. from a crash mid-write) is truncated, so that
+        new results are appended on a clean line.
+        """
+        if not os.path.exists(results_path):
+            return 0
+
+        last_line = 0
+        valid_end = 0
+        with open(results_path, 'rb') as file:
+            offset = 0
+            for raw in file:
+                offset += len(raw)
+                if not raw.endswith(b"\n"):
+                    break
+                valid_end = offset
+                try:
+                    last_line = int(json.loads(raw)["line"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+        if valid_end < os.path.getsize(results_path):
+            with open(results_path, 'rb+') as file:
+                file.truncate(valid_end)
+        return last_line
+
+    def iter_batch(self, manifest_path: str, results_path: str = "",
+                   resume: bool = True, dedupe_threshold: float = 0.0) -> Iterator[dict]:
+        """Process the manifest, appending and yielding each result as it finishes
+
+        A dedupe_threshold above 0 (a Jaccard similarity, e.g. 0.8) adds a
+        first pass that clusters near-duplicate job descriptions, keeping one
+        MinHash signature per cluster in memory.
+        """
+        if not results_path:
+            results_path = os.path.splitext(manifest_path)[0] + ".results.jsonl"
+
+        dir_path = os.path.dirname(results_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        if resume:
+            start_after = self.last_completed_line(results_path)
+            mode = 'a'
+        else:
+            start_after = 0
+            mode = 'w'
+
+        clusters = self.cluster_jobs(manifest_path, dedupe_threshold) if dedupe_threshold else {}
+        # Only clusters with several members share a letter, and each shared
+        # letter is dropped after the cluster's last line so the cache stays small
+        last_lines = {}
+        for line_number, cluster in clusters.items():
+            last_lines[cluster] = line_number
+        clusters = {line_number: cluster for line_number, cluster in clusters.items()
+                    if last_lines[cluster] != cluster}
+        self._letter_cache = {}
+
+        with open(results_path, mode, encoding='utf-8') as results:
+            for line_number, job, error in self.iter_jobs(manifest_path, start_after):
+                if error:
+                    record = {"line": line_number, "status": "error", "error": error,
+                              "timings": {"total": 0.0}}
+                else:
+                    cluster = clusters.get(line_number, 0)
+                    record = self.process_job(job, line_number, cluster)
+                    if cluster and last_lines[cluster] == line_number:
+                        for key in [key for key in self._letter_cache if key[1] == cluster]:
+                            del self._letter_cache[key]
+
+                results.write(json.dumps(record, ensure_ascii=False) + "\n")
+                results.flush()
+                os.fsync(results.fileno())
+                yield record
+
+    def run_batch(self, manifest_path: str, results_path: str = "",
+                  resume: bool = True, dedupe_threshold: float = 0.0) -> str:
+        """Generate cover letters for every job in a JSONL manifest"""
+        if not os.path.exists(manifest_path):
+            return f"File not found: {manifest_path}"
+
+        if not results_path:
+            results_path = os.path.splitext(manifest_path)[0] + ".results.jsonl"
+
+        succeeded = failed = reused = 0
+        start = time.perf_counter()
+        try:
+            for record in self.iter_batch(manifest_path, results_path, resume, dedupe_threshold):
+                if record["status"] == "ok":
+                    succeeded += 1
+                    reused += 1 if "duplicate_of" in record else 0
+                else:
+                    failed += 1
+        except Exception as e:
+            return f"Error running batch {manifest_path}: {str(e)}"
+
+        elapsed = time.perf_counter() - start
+        self.last_summary = (f"Batch complete: {succeeded} succeeded, {failed} failed "
+                             f"in {elapsed:.2f}s. Results written to {results_path}")
+        if dedupe_threshold:
+            self.last_summary += f"\n{reused} letters reused from near-duplicate job descriptions"
+        return self.last_summary
+
+    def get_last_summary(self) -> str:
+        """Get the summary of the last batch run"""
+        return self.last_summary if self.last_summary else "No batch run yet"
@@ -29,76 +29,101 @@ Sincerely,
                             output_file: str = "", generate_pdf: bool = True) -> str:
         """Generate a cover letter based on resume and job description"""
         
-        # Extract key information
-        company = company_name if company_name else "the organization"
-        position = position_title if position_title else "the position"
+        candidate_name = self._extract_name_from_resume(resume_text)
+        cover_letter = self._compose_cover_letter(resume_text, job_description, candidate_name)
+        cover_letter = self._fill_cover_letter(cover_letter, company_name, position_title)
+        
+        # Save to file if specified
+        if output_file:
+            company = company_name if company_name else "the organization"
+            position = position_title if position_title else "the position"
+            result_message = self._save_cover_letter(cover_letter, output_file, generate_pdf,
+                                                     candidate_name, position, company)
+            if result_message.startswith("Cover letter generated but failed to save"):
+                return f"{result_message}\n\n{cover_letter}"
+            return f"{result_message}:\n\n{cover_letter}"
+        
+        return f"Cover letter generated:\n\n{cover_letter}"
+    
+    def _compose_cover_letter(self, resume_text: str, job_description: str,
+                              candidate_name: str = "") -> str:
+        """Fill the template from resume and job description, leaving the
+        {{company}}, {{position}} and {{position_lower}} placeholders in place"""
         
         # Create a basic cover letter
         cover_letter = self.cover_letter_template
         
-        # Replace placeholders
-        cover_letter = cover_letter.replace("{{position}}", position)
-        cover_letter = cover_letter.replace("{{company}}", company)
-        
         # Add relevant experience section
         experience_section = self._extract_relevant_experience(resume_text, job_description)
         cover_letter = cover_letter.replace("{{relevant_experience}}", experience_section)
         
         # Add why company section
-        why_company = f"it aligns with my career goals and offers the opportunity to apply my skills in {position.lower()}"
+        why_company = "it aligns with my career goals and offers the opportunity to apply my skills in {{position_lower}}"
         cover_letter = cover_letter.replace("{{why_company}}", why_company)
         
         # Extract key skills
         key_skills = self._extract_key_skills(resume_text, job_description)
         cover_letter = cover_letter.replace("{{key_skills}}", key_skills)
         
-        # Extract and replace name
-        candidate_name = self._extract_name_from_resume(resume_text)
+        # Extract and replace name, unless the caller already has it
+        if not candidate_name:
+            candidate_name = self._extract_name_from_resume(resume_text)
         cover_letter = cover_letter.replace("{{Your Name}}", candidate_name)
         
-        # Save to file if specified
-        if output_file:
-            try:
-                # Create directory if it doesn't exist (only if there's a directory path)
-                dir_path = os.path.dirname(output_file)
-                if dir_path:  # Only create directory if path is not empty
-                    os.makedirs(dir_path, exist_ok=True)
-                
-                # Save text file
-                with open(output_file, 'w', encoding='utf-8') as file:
-                    file.write(cover_letter)
-                
-                result_message = f"Cover letter generated and saved to {output_file}"
-                
-                # Generate PDF if requested
-                if generate_pdf:
-                    pdf_file = os.path.splitext(output_file)[0] + ".pdf"
-                    try:
-                        from .PDFGeneratorTool import PDFGeneratorTool
-                        pdf_generator = PDFGeneratorTool()
-                        
-                        pdf_result = pdf_generator.create_cover_letter_pdf(
-                            cover_letter_text=cover_letter,
-                            output_file=pdf_file,
-                            applicant_name=candidate_name,
-                            position=position,
-                            company=company
-                        )
-                        
-                        if "successfully created" in pdf_result:
-                            result_message += f"\nPDF version saved to {pdf_file}"
-                        else:
-                            result_message += f"\nPDF generation note: {pdf_result}"
-                            
-                    except Exception as pdf_error:
-                        result_message += f"\nPDF generation failed: {str(pdf_error)}"
-                
-                return f"{result_message}:\n\n{cover_letter}"
-                
-            except Exception as e:
-                return f"Cover letter generated but failed to save to {output_file}: {str(e)}\n\n{cover_letter}"
+        return cover_letter
+    
+    def _fill_cover_letter(self, cover_letter: str, company_name: str = "",
+                           position_title: str = "") -> str:
+        """Substitute company and position into a letter from _compose_cover_letter"""
+        company = company_name if company_name else "the organization"
+        position = position_title if position_title else "the position"
         
-        return f"Cover letter generated:\n\n{cover_letter}"
+        cover_letter = cover_letter.replace("{{position_lower}}", position.lower())
+        cover_letter = cover_letter.replace("{{position}}", position)
+        return cover_letter.replace("{{company}}", company)
+    
+    def _save_cover_letter(self, cover_letter: str, output_file: str, generate_pdf: bool = True,
+                           applicant_name: str = "", position: str = "", company: str = "") -> str:
+        """Save a cover letter to a text file and optionally a PDF alongside it"""
+        try:
+            # Create directory if it doesn't exist (only if there's a directory path)
+            dir_path = os.path.dirname(output_file)
+            if dir_path:  # Only create directory if path is not empty
+                os.makedirs(dir_path, exist_ok=True)
+            
+            # Save text file
+            with open(output_file, 'w', encoding='utf-8') as file:
+                file.write(cover_letter)
+            
+            result_message = f"Cover letter generated and saved to {output_file}"
+            
+            # Generate PDF if requested
+            if generate_pdf:
+                pdf_file = os.path.splitext(output_file)[0] + ".pdf"
+                try:
+                    from .PDFGeneratorTool import PDFGeneratorTool
+                    pdf_generator = PDFGeneratorTool()
+                    
+                    pdf_result = pdf_generator.create_cover_letter_pdf(
+                        cover_letter_text=cover_letter,
+                        output_file=pdf_file,
+                        applicant_name=applicant_name,
+                        position=position,
+                        company=company
+                    )
+                    
+                    if "successfully created" in pdf_result:
+                        result_message += f"\nPDF version saved to {pdf_file}"
+                    else:
+                        result_message += f"\nPDF generation note: {pdf_result}"
+                        
+                except Exception as pdf_error:
+                    result_message += f"\nPDF generation failed: {str(pdf_error)}"
+            
+            return result_message
+            
+        except Exception as e:
+            return f"Cover letter generated but failed to save to {output_file}: {str(e)}"
     
     def _extract_relevant_experience(self, resume_text: str, job_description: str) -> str:
         """Extract relevant experience from resume that matches job description"""
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Near-duplicate detection tool for job descriptions using MinHash and LSH"""
+
+import re
+import random
+import hashlib
+from typing import Dict, List, Tuple
+
+from .TextFileTool import TextFileTool
+
+# Mersenne prime used for the universal hash family
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+class DedupTool:
+    """Tool for grouping near-duplicate job descriptions
+
+    Each text is reduced to a MinHash signature over word shingles. Only the
+    first text of each cluster (its representative) is indexed: signatures
+    are split into bands and hashed into LSH buckets, so a new text is only
+    compared against the representatives sharing a bucket with it. It joins
+    the most similar one if that reaches the threshold, otherwise it starts a
+    new cluster. Clusters are never merged, so every member is within the
+    threshold of its representative (A~B and B~C does not put C with A).
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128,
+                 shingle_size: int = 5, seed: int = 1):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = self._optimal_bands(threshold, num_perm)
+
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        self.text_tool = TextFileTool()
+        self.reset()
+
+    def reset(self):
+        """Forget every text added so far"""
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [{} for _ in range(self.bands)]
+        # Signatures are only kept for representatives
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._clusters: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+
+    @staticmethod
+    def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """Pick the band/row split whose S-curve crosses closest to the threshold"""
+        best = (1, num_perm)
+        best_error = float("inf")
+        for rows in range(1, num_perm + 1):
+            bands = num_perm // rows
+            # Similarity at which a pair has a 50% chance of becoming a candidate
+            crossing = (1.0 / bands) ** (1.0 / rows)
+            error = abs(crossing - threshold)
+            if error < best_error:
+                best, best_error = (bands, rows), error
+        return best
+
+    def _shingles(self, text: str) -> set:
+        """Hash the normalized word shingles of a text to 32-bit integers"""
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        if len(words) < self.shingle_size:
+            grams = [" ".join(words)] if words else []
+        else:
+            grams = [" ".join(words[i:i + self.shingle_size])
+                     for i in range(len(words) - self.shingle_size + 1)]
+        return {
+            int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "little")
+            for gram in grams
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a text"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return tuple([_MAX_HASH] * self.num_perm)
+
+        return tuple(
+            min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles)
+            for a, b in self._permutations
+        )
+
+    def estimate_similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimate the Jaccard similarity of two signatures"""
+        matches = sum(1 for x, y in zip(first, second) if x == y)
+        return matches / self.num_perm
+
+    def add(self, key: str, text: str) -> str:
+        """Add a text and return the key of the cluster it belongs to
+
+        The representative of a cluster is the first key added to it.
+        """
+        signature = self.signature(text)
+        band_keys = [signature[band * self.rows:(band + 1) * self.rows] for band in range(self.bands)]
+
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            candidates.update(buckets.get(band_key, []))
+
+        best, best_similarity = "", 0.0
+        # Ties go to the earliest cluster, so the result does not depend on set order
+        for candidate in sorted(candidates, key=self._order.__getitem__):
+            similarity = self.estimate_similarity(signature, self._signatures[candidate])
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+
+        if best and best_similarity >= self.threshold:
+            self._clusters[key] = best
+            return best
+
+        # A new cluster, indexed so later texts can join it
+        self._clusters[key] = key
+        self._signatures[key] = signature
+        self._order[key] = len(self._order)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets.setdefault(band_key, []).append(key)
+        return key
+
+    def cluster_of(self, key: str) -> str:
+        """Get the cluster representative of a previously added key"""
+        return self._clusters[key]
+
+    def clusters(self) -> List[List[str]]:
+        """Group every added key by cluster, in insertion order"""
+        groups: Dict[str, List[str]] = {}
+        for key, representative in self._clusters.items():
+            groups.setdefault(representative, []).append(key)
+        return list(groups.values())
+
+    def find_duplicate_job_descriptions(self, file_paths: List[str]) -> str:
+        """Group job description files into clusters of near-duplicates"""
+        self.reset()
+        errors = []
+        for file_path in file_paths:
+            content = self.text_tool.read_text_file(file_path)
+            if not content.startswith("Successfully read"):
+                errors.append(content)
+                continue
+            self.add(file_path, self.text_tool.last_read_content)
+
+        clusters = self.clusters()
+        duplicates = [cluster for cluster in clusters if len(cluster) > 1]
+
+        lines = [f"Found {len(clusters)} distinct job descriptions in {len(self._clusters)} files "
+                 f"({len(duplicates)} groups of near-duplicates, threshold {self.threshold}):"]
+        for cluster in duplicates:
+            lines.append(f"- {cluster[0]} duplicated by: {', '.join(cluster[1:])}")
+        lines.extend(errors)
+        return "\n".join(lines)
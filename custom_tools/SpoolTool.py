@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Shared filesystem job spool for running cover letter workers on many hosts"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from typing import Optional
+
+from .BatchTool import BatchTool
+
+class SpoolTool:
+    """Tool for queueing cover letter jobs in a shared spool directory
+
+    The spool is a directory (local or on a shared filesystem such as NFS)
+    with one JSON file per job:
+
+        pending/<job_id>.<attempt>.json           waiting to be claimed
+        claimed/<job_id>.<attempt>.<worker>.json  leased by a worker
+        done/<job_id>.json                        job and result record
+        failed/<job_id>.json                      job and error record
+
+    Every state change is a single atomic rename, so when several workers race
+    for the same file exactly one of them wins. A claimed file's modification
+    time is its lease: the owning worker touches it as a heartbeat, and any
+    worker may move a claim whose lease has expired back to pending (or to
+    failed after max_attempts). Lease expiry is judged against the local
+    clock, so lease_seconds should be well above the clock skew between hosts.
+    """
+
+    def __init__(self, spool_dir: str = "./spool", lease_seconds: float = 60.0,
+                 max_attempts: int = 3, worker_id: str = ""):
+        self.spool_dir = os.path.abspath(spool_dir)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Dots separate the fields of a claimed file name
+        default_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.worker_id = (worker_id or default_id).replace(".", "-")
+        self.batch_tool = BatchTool()
+
+        for state in ("pending", "claimed", "done", "failed", "tmp"):
+            os.makedirs(os.path.join(self.spool_dir, state), exist_ok=True)
+
+    def _path(self, state: str, name: str) -> str:
+        return os.path.join(self.spool_dir, state, name)
+
+    def _write_atomic(self, state: str, name: str, data: dict):
+        """Write a JSON file into a spool state directory in one rename"""
+        tmp_path = self._path("tmp", f"{name}.{self.worker_id}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self._path(state, name))
+
+    def enqueue_job(self, job: dict, job_id: str = "") -> str:
+        """Add a job to the spool and return its id"""
+        job_id = (job_id or uuid.uuid4().hex).replace(".", "-")
+        job = dict(job)
+        # Fix the output path now so a retried job overwrites the same files
+        if not job.get("output"):
+            job["output"] = os.path.abspath(f"./output/cover_letter_{job_id}/cover_letter.txt")
+        self._write_atomic("pending", f"{job_id}.1.json", {"id": job_id, "job": job})
+        return job_id
+
+    def enqueue_manifest(self, manifest_path: str) -> str:
+        """Add every job from a JSONL manifest to the spool"""
+        if not os.path.exists(manifest_path):
+            return f"File not found: {manifest_path}"
+
+        queued = skipped = 0
+        for line_number, job, error in self.batch_tool.iter_jobs(manifest_path):
+            if error:
+                skipped += 1
+                continue
+            self.enqueue_job(job)
+            queued += 1
+        return f"Queued {queued} jobs from {manifest_path} into {self.spool_dir} ({skipped} invalid lines skipped)"
+
+    def requeue_expired(self) -> int:
+        """Move claims whose lease has expired back to pending, return how many"""
+        now = time.time()
+        requeued = 0
+        for name in os.listdir(self._path("claimed", "")):
+            path = self._path("claimed", name)
+            try:
+                if now - os.path.getmtime(path) < self.lease_seconds:
+                    continue
+                job_id, attempt = name.split(".")[:2]
+                attempt = int(attempt)
+                if attempt >= self.max_attempts:
+                    os.rename(path, self._path("failed", f"{job_id}.json"))
+                    with open(self._path("failed", f"{job_id}.json"), 'r', encoding='utf-8') as file:
+                        entry = json.load(file)
+                    entry["result"] = {"id": job_id, "attempt": attempt, "status": "error",
+                                       "error": f"Abandoned by its worker {attempt} times"}
+                    self._write_atomic("failed", f"{job_id}.json", entry)
+                else:
+                    os.rename(path, self._path("pending", f"{job_id}.{attempt + 1}.json"))
+                    requeued += 1
+            except (FileNotFoundError, ValueError):
+                # Completed, heartbeated or reaped by another worker meanwhile
+                continue
+        return requeued
+
+    def claim_job(self) -> Optional[dict]:
+        """Lease the next pending job, or return None if there is none"""
+        for name in sorted(os.listdir(self._path("pending", ""))):
+            if not name.endswith(".json"):
+                continue
+            job_id, attempt = name.split(".")[:2]
+            pending_path = self._path("pending", name)
+            claimed_path = self._path("claimed", f"{job_id}.{attempt}.{self.worker_id}.json")
+            try:
+                # A rename keeps the old mtime, so start the lease before moving
+                os.utime(pending_path)
+                os.rename(pending_path, claimed_path)
+                with open(claimed_path, 'r', encoding='utf-8') as file:
+                    entry = json.load(file)
+            except FileNotFoundError:
+                continue  # Another worker claimed it first
+            return {"id": job_id, "attempt": int(attempt), "path": claimed_path, "job": entry["job"]}
+        return None
+
+    def _heartbeat(self, claimed_path: str, stop: threading.Event, lost: threading.Event):
+        """Refresh the lease until stopped, flag the claim as lost if it vanishes"""
+        while not stop.wait(self.lease_seconds / 3):
+            try:
+                os.utime(claimed_path)
+            except FileNotFoundError:
+                lost.set()
+                return
+
+    def process_claim(self, claim: dict) -> dict:
+        """Run a claimed job through the pipeline while keeping its lease alive"""
+        stop, lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat,
+                                     args=(claim["path"], stop, lost), daemon=True)
+        heartbeat.start()
+        try:
+            record = self.batch_tool.process_job(claim["job"])
+        except Exception as e:
+            record = {"status": "error", "error": f"worker: {str(e)}", "timings": {}}
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        record.pop("line", None)
+        record.update({"id": claim["id"], "attempt": claim["attempt"], "worker": self.worker_id})
+
+        # Renaming the claim is the acknowledgement, only the lease holder can do it.
+        # The result goes into the claim first, so a crash never leaves a done or
+        # failed entry without one
+        state = "done" if record["status"] == "ok" else "failed"
+        try:
+            if lost.is_set():
+                raise FileNotFoundError(claim["path"])
+            # Renew the lease so nobody requeues the claim while it is rewritten
+            os.utime(claim["path"])
+            self._write_atomic("claimed", os.path.basename(claim["path"]),
+                               {"id": claim["id"], "job": claim["job"], "result": record})
+            os.rename(claim["path"], self._path(state, f"{claim['id']}.json"))
+        except FileNotFoundError:
+            record["status"] = "lost"
+            record["error"] = "Lease expired before the job finished, it was handed to another worker"
+        return record
+
+    def run_worker(self, max_jobs: int = 0, exit_when_empty: bool = True,
+                   poll_interval: float = 1.0) -> str:
+        """Claim and process jobs until the spool is drained"""
+        processed = succeeded = failed = lost = 0
+        while not max_jobs or processed < max_jobs:
+            self.requeue_expired()
+            claim = self.claim_job()
+            if claim is None:
+                # Claims held by other workers may still expire and come back
+                if exit_when_empty and not os.listdir(self._path("claimed", "")):
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            record = self.process_claim(claim)
+            processed += 1
+            if record["status"] == "ok":
+                succeeded += 1
+            elif record["status"] == "lost":
+                lost += 1
+            else:
+                failed += 1
+
+        return (f"Worker {self.worker_id} processed {processed} jobs: "
+                f"{succeeded} succeeded, {failed} failed, {lost} lost to expired leases")
+
+    def get_status(self) -> str:
+        """Count the jobs in each spool state"""
+        counts = {state: len([name for name in os.listdir(self._path(state, "")) if name.endswith(".json")])
+                  for state in ("pending", "claimed", "done", "failed")}
+        return f"Spool {self.spool_dir}: " + ", ".join(f"{count} {state}" for state, count in counts.items())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Streaming cover letter generation tool with time-to-first-token reporting"""
+
+import os
+import sys
+import time
+from typing import Callable, Optional
+
+import openai
+
+from .PDFGeneratorTool import PDFGeneratorTool
+
+# The agent prompt (CLGenerator.md) describes a tool workflow, this request has no tools
+PROMPT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "prompts", "CLWriter.md")
+
+class StreamingCoverLetterTool:
+    """Tool for writing a cover letter with the LLM and streaming it as it arrives
+
+    Tokens go to a callback (the terminal by default) and to "<output>.part"
+    as they arrive. When the stream ends the partial file is renamed to the
+    output file and the PDF is rendered straight away.
+    """
+
+    def __init__(self, model: str = "", api_key: Optional[str] = None):
+        self.model = model or os.getenv("COVER_LETTER_MODEL", "o4-mini")
+        self.api_key = api_key
+        self._client = None
+        self.last_timings = {}
+        self.last_cover_letter = ""
+
+    @property
+    def client(self) -> openai.OpenAI:
+        # Created lazily so OPENAI_BASE_URL / OPENAI_API_KEY can be set first
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+
+    def _system_prompt(self) -> str:
+        try:
+            with open(PROMPT_FILE, 'r', encoding='utf-8') as file:
+                return file.read()
+        except OSError:
+            return "You are a professional cover letter writer. Reply with the cover letter text only."
+
+    def _print_token(self, token: str):
+        sys.stdout.write(token)
+        sys.stdout.flush()
+
+    def stream_cover_letter(self, resume_text: str, job_description: str,
+                            company_name: str = "", position_title: str = "",
+                            output_file: str = "cover_letter.txt", generate_pdf: bool = True,
+                            on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Generate a cover letter with the LLM, streaming tokens as they arrive"""
+        company = company_name if company_name else "the organization"
+        position = position_title if position_title else "the position"
+        on_token = on_token or self._print_token
+
+        prompt = f"""Write a professional, personalized cover letter based on this resume and job description.
+Company: {company}
+Position: {position}
+
+Resume:
+{resume_text}
+
+Job description:
+{job_description}
+
+Reply with the cover letter text only, no preamble or commentary."""
+
+        dir_path = os.path.dirname(output_file)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        partial_file = output_file + ".part"
+
+        timings = {}
+        self.last_timings = timings
+        self.last_cover_letter = ""
+        start = time.perf_counter()
+        chunks = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self._system_prompt()},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            with open(partial_file, 'w', encoding='utf-8') as file:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    token = chunk.choices[0].delta.content
+                    if not token:
+                        continue
+                    if "time_to_first_token" not in timings:
+                        timings["time_to_first_token"] = time.perf_counter() - start
+                    chunks.append(token)
+                    file.write(token)
+                    file.flush()
+                    on_token(token)
+        except Exception as e:
+            # The request can fail before the partial file is opened
+            if os.path.exists(partial_file):
+                return f"Error streaming cover letter (partial text kept in {partial_file}): {str(e)}"
+            return f"Error streaming cover letter: {str(e)}"
+
+        cover_letter = "".join(chunks).strip()
+        if not cover_letter:
+            os.remove(partial_file)
+            return "Error streaming cover letter: the model returned no text"
+
+        self.last_cover_letter = cover_letter
+        os.replace(partial_file, output_file)
+        timings["time_to_complete"] = time.perf_counter() - start
+        result_message = f"Cover letter streamed and saved to {output_file}"
+
+        # The text is final, render the PDF right away
+        if generate_pdf:
+            pdf_file = os.path.splitext(output_file)[0] + ".pdf"
+            pdf_result = PDFGeneratorTool().create_cover_letter_pdf(
+                cover_letter_text=cover_letter,
+                output_file=pdf_file,
+                position=position,
+                company=company
+            )
+            timings["time_to_pdf"] = time.perf_counter() - start
+            if "successfully created" in pdf_result:
+                result_message += f"\nPDF version saved to {pdf_file}"
+            else:
+                result_message += f"\nPDF generation note: {pdf_result}"
+
+        result_message += "\n" + self.get_last_timings()
+        return result_message
+
+    def get_last_timings(self) -> str:
+        """Get the timings of the last streamed cover letter"""
+        if not self.last_timings:
+            return "No cover letter streamed yet"
+        labels = {"time_to_first_token": "first token", "time_to_complete": "complete", "time_to_pdf": "PDF ready"}
+        return "Timings: " + ", ".join(f"{labels[key]} {value:.2f}s" for key, value in self.last_timings.items())
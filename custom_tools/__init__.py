@@ -1,4 +1,8 @@
 from .PDFTool import *
 from .TextFileTool import *
 from .CoverLetterTool import *
-from .PDFGeneratorTool import *
\ No newline at end of file
+from .PDFGeneratorTool import *
+from .BatchTool import *
+from .DedupTool import *
+from .SpoolTool import *
+from .StreamingCoverLetterTool import *
\ No newline at end of file
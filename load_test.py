@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Load test for the agent-driven cover letter flow
+
+Runs generate_cover_letter_direct from cover_letter_agent.py against the local
+stub LLM server at increasing concurrency and reports letters/sec and latency
+percentiles for each level:
+
+    python load_test.py --concurrency 1 2 4 8 16 --letters 32 --latency 0.2 --tokens-per-second 100
+
+Use --base-url to target an already running stub (or any compatible endpoint)
+instead of starting one in-process.
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+import itertools
+import tempfile
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+from stub_llm_server import StubLLMServer, STUB_RESUME_TEXT
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[index]
+
+def run_level(concurrency: int, letters: int, resume_path: str, job_path: str, output_dir: str) -> dict:
+    """Generate letters with a fixed number of concurrent agents"""
+    import cover_letter_agent
+
+    # Agents and their tools keep per-call state, so each thread gets its own.
+    # Each also gets its own name and history file inside output_dir, so the
+    # threads don't rewrite one file or touch the user's real agent history.
+    local = threading.local()
+    agent_numbers = itertools.count()
+
+    def generate(index: int):
+        if not hasattr(local, "agent"):
+            name = f"LoadTest_c{concurrency}_{next(agent_numbers)}"
+            local.agent = cover_letter_agent.create_agent(
+                name=name, history_dir=os.path.join(output_dir, "history", name))
+        output_file = os.path.join(output_dir, f"c{concurrency}_{index}", "cover_letter.txt")
+        start = time.perf_counter()
+        try:
+            cover_letter_agent.generate_cover_letter_direct(
+                resume_pdf_path=resume_path,
+                job_txt_path=job_path,
+                company_name=f"Company {index}",
+                position_title="Software Developer",
+                output_file=output_file,
+                agent=local.agent,
+            )
+            return time.perf_counter() - start, ""
+        except Exception as e:
+            return time.perf_counter() - start, str(e)
+
+    start = time.perf_counter()
+    # The agent flow prints progress, keep the report readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(generate, range(letters)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, error in results if not error]
+    errors = [error for latency, error in results if error]
+    return {
+        "concurrency": concurrency,
+        "letters": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else "",
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the cover letter agent against a stub LLM")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--letters", type=int, default=16, help="Letters per concurrency level")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Stub output throughput")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub requests that fail")
+    parser.add_argument("--base-url", default="", help="Use a running endpoint instead of an in-process stub")
+    parser.add_argument("--resume", default="", help="Resume PDF (a sample one is generated if empty)")
+    parser.add_argument("--job", default="./input/job_description.txt", help="Job description text file")
+    args = parser.parse_args()
+
+    resume_path = os.path.abspath(args.resume) if args.resume else ""
+    job_path = os.path.abspath(args.job)
+    # Relative paths in the agent (e.g. the system prompt) assume the repo root
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    server = None
+    if not args.base_url:
+        server = StubLLMServer(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                               error_rate=args.error_rate, seed=0).start()
+        args.base_url = server.base_url
+
+    # Must be set before the first OpenAI client is created
+    os.environ["OPENAI_BASE_URL"] = args.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    output_dir = tempfile.mkdtemp(prefix="cover_letter_load_")
+    if not resume_path:
+        from custom_tools import PDFGeneratorTool
+        resume_path = os.path.join(output_dir, "sample_resume.pdf")
+        PDFGeneratorTool().create_pdf_from_text(STUB_RESUME_TEXT, resume_path, title="Resume")
+    print(f"🧪 Load testing against {args.base_url}, outputs in {output_dir}")
+    # The OpenAI client retries failed requests, so injected errors rarely
+    # reach the agent; the stub's own counts show them
+    print(f"{'concurrency':>11} {'letters':>8} {'errors':>7} {'requests':>9} {'injected':>9} "
+          f"{'letters/s':>10} {'p50 s':>8} {'p90 s':>8} {'p99 s':>8}")
+    try:
+        for concurrency in args.concurrency:
+            requests_before = server.request_count if server else 0
+            injected_before = server.error_count if server else 0
+            report = run_level(concurrency, args.letters, resume_path, job_path, output_dir)
+            requests = str(server.request_count - requests_before) if server else "-"
+            injected = str(server.error_count - injected_before) if server else "-"
+            print(f"{report['concurrency']:>11} {report['letters']:>8} {report['errors']:>7} {requests:>9} {injected:>9} "
+                  f"{report['throughput']:>10.2f} {report['p50']:>8.3f} {report['p90']:>8.3f} {report['p99']:>8.3f}")
+            if report["first_error"]:
+                print(f"   ❌ {report['first_error']}", file=sys.stderr)
+    finally:
+        if server:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Spool worker for generating cover letters on any number of hosts
+
+Queue a JSONL job manifest into a shared spool directory, then start as many
+workers as needed on any host that can see the spool:
+
+    python spool_worker.py enqueue input/jobs.jsonl --spool /mnt/shared/spool
+    python spool_worker.py work --spool /mnt/shared/spool
+    python spool_worker.py status --spool /mnt/shared/spool
+
+To check the spool on this machine, run several local worker processes
+against a temporary spool that includes one abandoned claim:
+
+    python spool_worker.py selftest --workers 4 --jobs 40
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import argparse
+import tempfile
+import subprocess
+from custom_tools import SpoolTool, PDFGeneratorTool
+
+def run_selftest(workers: int, jobs: int, lease: float) -> bool:
+    """Drain a temporary spool with several worker processes and check the results"""
+    work_dir = tempfile.mkdtemp(prefix="spool_selftest_")
+    spool_dir = os.path.join(work_dir, "spool")
+    resume_path = os.path.join(work_dir, "resume.pdf")
+    PDFGeneratorTool().create_pdf_from_text("Jane Doe\nPython developer with AWS and SQL experience",
+                                            resume_path, title="Resume")
+
+    spool_tool = SpoolTool(spool_dir, lease_seconds=lease, worker_id="selftest")
+    for index in range(jobs):
+        spool_tool.enqueue_job({
+            "resume": resume_path,
+            "job_text": f"Python and AWS developer role number {index}",
+            "company": f"Company {index}",
+            "output": os.path.join(work_dir, "output", f"job_{index}", "cover_letter.txt"),
+        }, job_id=f"job{index:04d}")
+
+    # Claim one job and never finish it, like a worker that crashed
+    abandoned = spool_tool.claim_job()
+    print(f"🧪 {jobs} jobs queued in {spool_dir}, {abandoned['id']} abandoned by a fake crashed worker")
+
+    script = os.path.abspath(__file__)
+    processes = [subprocess.Popen([sys.executable, script, "work", "--spool", spool_dir, "--lease", str(lease)],
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+                 for _ in range(workers)]
+    outputs = [process.communicate()[0] for process in processes]
+    exit_codes = [process.returncode for process in processes]
+    # done/ is keyed by job id, so only the workers' own counts show double work.
+    # Every job is claimed once, plus the abandoned claim
+    claims = 1 + sum(int(count) for output in outputs for count in re.findall(r"processed (\d+) jobs", output))
+
+    results = [json.load(open(path, encoding='utf-8'))["result"]
+               for path in glob.glob(os.path.join(spool_dir, "done", "*.json"))]
+    done_ids = sorted(result["id"] for result in results)
+    retried = [result for result in results if result["id"] == abandoned["id"]]
+    workers_used = {result["worker"] for result in results}
+
+    checks = [
+        ("all workers exited cleanly", all(code == 0 for code in exit_codes)),
+        (f"all {jobs} jobs done", done_ids == [f"job{index:04d}" for index in range(jobs)]),
+        (f"{jobs + 1} claims in total, no job processed twice", claims == jobs + 1),
+        ("no jobs pending, claimed or failed", not any(os.listdir(os.path.join(spool_dir, state))
+                                                      for state in ("pending", "claimed", "failed"))),
+        ("abandoned job retried on attempt 2", bool(retried) and retried[0]["attempt"] == 2),
+    ]
+    for label, passed in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+    print(f"📊 Jobs were spread over {len(workers_used)} of {workers} worker processes")
+    return all(passed for label, passed in checks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared spool for cover letter jobs")
+    parser.add_argument("command", choices=["enqueue", "work", "status", "selftest"])
+    parser.add_argument("manifest", nargs="?", default="", help="JSONL job manifest (enqueue only)")
+    parser.add_argument("--spool", default="./spool", help="Spool directory shared by all workers")
+    parser.add_argument("--lease", type=float, default=None, help="Lease length in seconds (default 60, 2 for selftest)")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Claims before an abandoned job fails")
+    parser.add_argument("--max-jobs", type=int, default=0, help="Stop after this many jobs (0 = no limit)")
+    parser.add_argument("--keep-polling", action="store_true", help="Wait for new jobs instead of exiting when drained")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes to start (selftest only)")
+    parser.add_argument("--jobs", type=int, default=40, help="Jobs to queue (selftest only)")
+    args = parser.parse_args()
+
+    if args.command == "selftest":
+        sys.exit(0 if run_selftest(args.workers, args.jobs, args.lease or 2.0) else 1)
+
+    spool_tool = SpoolTool(args.spool, lease_seconds=args.lease or 60.0, max_attempts=args.max_attempts)
+
+    if args.command == "enqueue":
+        if not args.manifest:
+            parser.error("enqueue needs a manifest path")
+        print(f"📥 {spool_tool.enqueue_manifest(args.manifest)}")
+    elif args.command == "work":
+        print(f"👷 Worker {spool_tool.worker_id} draining {spool_tool.spool_dir}")
+        print(f"✅ {spool_tool.run_worker(max_jobs=args.max_jobs, exit_when_empty=not args.keep_polling)}")
+    print(f"📊 {spool_tool.get_status()}")
+
+if __name__ == "__main__":
+    main()
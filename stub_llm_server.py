@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI chat completions endpoint
+
+Serves POST /v1/chat/completions with configurable latency, token throughput
+and error rate, and answers with scripted tool calls so the agent flow in
+cover_letter_agent.py runs end to end without real API calls:
+
+    python stub_llm_server.py --port 8765 --latency 0.3 --tokens-per-second 80
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub python cover_letter_agent.py
+
+A script is a list of rules tried in order against the last user message.
+The first rule whose "match" regex is found answers with a call to "tool",
+with "{name}" in string arguments replaced by the regex's named groups. Once
+the conversation has a tool result, the stub replies with plain text.
+"""
+
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+STUB_RESUME_TEXT = """Jane Doe
+Software Developer
+Experience with Python, JavaScript, React, SQL, AWS, Docker and Git in agile teams."""
+
+STUB_JOB_DESCRIPTION = """We are looking for a developer with Python, React, SQL and AWS experience
+who enjoys working in an agile team and building APIs."""
+
+# Matches the prompts sent by cover_letter_agent.py
+DEFAULT_SCRIPT = [
+    {
+        "match": r"Company: (?P<company>.+?)\s*\n\s*Position: (?P<position>.+?)\s*\n\s*Output file: (?P<output_file>\S+)",
+        "tool": "generate_cover_letter",
+        "arguments": {
+            "resume_text": STUB_RESUME_TEXT,
+            "job_description": STUB_JOB_DESCRIPTION,
+            "company_name": "{company}",
+            "position_title": "{position}",
+            "output_file": "{output_file}",
+            "generate_pdf": True,
+        },
+    },
+    {
+        "match": r"[Jj]ob description from:?\s*(?P<file_path>\S+)",
+        "tool": "read_job_description",
+        "arguments": {"file_path": "{file_path}"},
+    },
+    {
+        "match": r"(?P<file_path>\S+\.pdf)",
+        "tool": "extract_resume_text",
+        "arguments": {"file_path": "{file_path}"},
+    },
+]
+
+# Sent when the request offers no tools, e.g. the streaming generation mode
+STUB_COVER_LETTER = """Dear Hiring Manager,
+
+I am excited to apply for the {position} role at {company}. Over the past years I have built web applications with Python, React and SQL, deployed them on AWS, and worked closely with agile teams to ship reliable features.
+
+In my recent work I designed and maintained APIs used by thousands of customers, improved query performance, and mentored newer developers. I would welcome the chance to bring the same care and curiosity to {company}.
+
+Thank you for your time and consideration. I look forward to discussing how I can contribute to your team.
+
+Sincerely,
+Jane Doe"""
+
+DEFAULT_REPLY = ("Done. {tool_result} Let me know if you would like any changes to the tone, "
+                 "length or highlighted experience.")
+
+
+class StubLLMServer:
+    """Threaded HTTP server imitating the OpenAI chat completions API"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 tokens_per_second: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 500, script: Optional[List[dict]] = None, seed: Optional[int] = None):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.script = script if script is not None else DEFAULT_SCRIPT
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+        handler = type("StubHandler", (_StubHandler,), {"stub": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            failed = self._random.random() < self.error_rate
+            self.error_count += failed
+            return failed
+
+    def respond(self, messages: List[dict], tools: Optional[List[dict]] = None) -> dict:
+        """Pick the scripted reply for a conversation: a tool call or text"""
+        if messages and messages[-1].get("role") == "tool":
+            tool_result = str(messages[-1].get("content") or "").split("\n", 1)[0]
+            return {"content": DEFAULT_REPLY.format(tool_result=tool_result)}
+
+        prompt = next((str(m.get("content") or "") for m in reversed(messages)
+                       if m.get("role") == "user"), "")
+        if not tools:
+            company = re.search(r"Company: (.+)", prompt)
+            position = re.search(r"Position: (.+)", prompt)
+            return {"content": STUB_COVER_LETTER.format(
+                company=company.group(1).strip() if company else "your company",
+                position=position.group(1).strip() if position else "open")}
+
+        for rule in self.script:
+            match = re.search(rule["match"], prompt)
+            if not match:
+                continue
+            groups = match.groupdict()
+            arguments = {key: value.format(**groups) if isinstance(value, str) else value
+                         for key, value in rule.get("arguments", {}).items()}
+            return {"tool_call": {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                                  "function": {"name": rule["tool"], "arguments": json.dumps(arguments)}}}
+
+        return {"content": "I can read a resume PDF, read a job description and generate a cover letter."}
+
+    def token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    stub: StubLLMServer = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        stub = self.stub
+
+        time.sleep(stub.latency)
+        if stub.should_fail():
+            self._send_json(stub.error_status, {"error": {"message": "Injected stub error",
+                                                          "type": "server_error"}})
+            return
+
+        reply = stub.respond(request.get("messages", []), request.get("tools"))
+        content = reply.get("content")
+        tokens = re.findall(r"\S+\s*", content) if content else []
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = request.get("model", "stub")
+
+        if request.get("stream"):
+            self._stream(completion_id, model, reply, tokens)
+            return
+
+        # Spend the time it would take to generate the whole reply
+        time.sleep(stub.token_delay() * max(len(tokens), 1))
+        message = {"role": "assistant", "content": content}
+        if "tool_call" in reply:
+            message["tool_calls"] = [reply["tool_call"]]
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message,
+                         "finish_reason": "tool_calls" if "tool_call" in reply else "stop"}],
+            "usage": {"prompt_tokens": length // 4, "completion_tokens": len(tokens),
+                      "total_tokens": length // 4 + len(tokens)},
+        })
+
+    def _stream(self, completion_id: str, model: str, reply: dict, tokens: List[str]):
+        """Send the reply as server-sent events, one token per chunk"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(delta: dict, finish_reason: Optional[str] = None):
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send({"role": "assistant", "content": ""})
+        if "tool_call" in reply:
+            send({"tool_calls": [dict(reply["tool_call"], index=0)]})
+            send({}, "tool_calls")
+        else:
+            for token in tokens:
+                time.sleep(self.stub.token_delay())
+                send({"content": token})
+            send({}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub for the OpenAI chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Output throughput (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected errors (e.g. 429)")
+    parser.add_argument("--script", default="", help="JSON file with a list of tool-call rules")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, 'r', encoding='utf-8') as file:
+            script = json.load(file)
+
+    server = StubLLMServer(args.host, args.port, args.latency, args.tokens_per_second,
+                           args.error_rate, args.error_status, script, args.seed)
+    print(f"🧪 Stub LLM listening on {server.base_url}")
+    print(f"   export OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=stub")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()